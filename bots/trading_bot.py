@@ -6,7 +6,8 @@ and executing trades automatically.
 """
 
 import asyncio
-import json
+import logging
+import operator
 import time
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -23,8 +24,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from kalshi import config
-from kalshi.client import KalshiClient
+from kalshi import fastjson
+from kalshi.client import KalshiClient, MAX_BATCH_ORDERS
 from kalshi import auth
+from kalshi.runtime import start_log_listener, run_event_loop
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -52,7 +57,7 @@ class MarketState:
     no_ask: int = 0
     no_bid_qty: int = 0
     no_ask_qty: int = 0
-    last_update: datetime = field(default_factory=datetime.now)
+    last_update: float = field(default_factory=time.monotonic)  # Monotonic seconds
 
     @property
     def best_bid(self) -> int:
@@ -68,14 +73,16 @@ class MarketState:
 
     @property
     def spread(self) -> int:
-        if self.best_bid and self.best_ask:
-            return self.best_ask - self.best_bid
+        best_bid, best_ask = self.best_bid, self.best_ask
+        if best_bid and best_ask:
+            return best_ask - best_bid
         return 0
 
     @property
     def mid_price(self) -> float:
-        if self.best_bid and self.best_ask:
-            return (self.best_bid + self.best_ask) / 2
+        best_bid, best_ask = self.best_bid, self.best_ask
+        if best_bid and best_ask:
+            return (best_bid + best_ask) / 2
         return 0
 
     def best_buy_route(self) -> tuple:
@@ -111,10 +118,15 @@ class TradingBot:
         self.private_key_path = private_key_path or config.PRIVATE_KEY_PATH
         self.private_key = auth.load_private_key(self.private_key_path)
         self.client = KalshiClient(self.api_key, self.private_key_path)
+        start_log_listener(logger)
 
         # State tracking
         self.markets: dict[str, MarketState] = {}
         self.open_orders: dict[str, dict] = {}
+        self.pending_by_ticker: dict[str, set[str]] = {}  # ticker -> open order ids
+        self._requote: set[str] = set()  # Orders/position changed since last evaluation
+        self._quoting: set[str] = set()  # Tickers with an order request in flight
+        self._order_tasks: set[asyncio.Task] = set()  # Keeps in-flight requests referenced
         self.positions: dict[str, int] = {}
         self.trades: list[Trade] = []
         self.pnl: float = 0
@@ -134,6 +146,12 @@ class TradingBot:
         self.start_time = datetime.now()
         self.active_tickers = []
 
+        # Orderbook handlers keyed by message type
+        self.handlers = {
+            'orderbook_snapshot': self.process_snapshot,
+            'orderbook_delta': self.process_delta,
+        }
+
     # ==================== Trading Logic ====================
 
     def process_snapshot(self, data: dict):
@@ -142,20 +160,20 @@ class TradingBot:
         if not ticker:
             return
 
-        yes_orders = sorted(data.get('yes', []), key=lambda x: x[0], reverse=True)
-        no_orders = sorted(data.get('no', []), key=lambda x: x[0], reverse=True)
+        # Only the top level is used, so take the max rather than sorting
+        by_price = operator.itemgetter(0)
+        yes_top = max(data.get('yes') or (), key=by_price, default=None)
+        no_top = max(data.get('no') or (), key=by_price, default=None)
 
         state = MarketState(ticker=ticker)
 
-        if yes_orders:
-            state.yes_bid = yes_orders[0][0]
-            state.yes_bid_qty = yes_orders[0][1]
+        if yes_top:
+            state.yes_bid, state.yes_bid_qty = yes_top[0], yes_top[1]
 
-        if no_orders:
-            state.no_bid = no_orders[0][0]
-            state.no_bid_qty = no_orders[0][1]
+        if no_top:
+            state.no_bid, state.no_bid_qty = no_top[0], no_top[1]
 
-        state.last_update = datetime.now()
+        state.last_update = time.monotonic()
         self.markets[ticker] = state
 
         self._log(f"[{ticker[:30]}] YES bid:{state.yes_bid}c | NO bid:{state.no_bid}c -> " +
@@ -164,7 +182,12 @@ class TradingBot:
         self._evaluate_opportunity(ticker)
 
     def process_delta(self, data: dict):
-        """Process orderbook delta"""
+        """
+        Process orderbook delta.
+
+        Only re-evaluates the market if its top of book moved, or if its
+        orders or position changed since it was last evaluated.
+        """
         ticker = data.get('market_ticker')
         if not ticker or ticker not in self.markets:
             return
@@ -173,29 +196,41 @@ class TradingBot:
         price = data.get('price', 0)
         delta = data.get('delta', 0)
         side = data.get('side')
+        changed = False
 
         if side == 'yes' and delta > 0:
             if price > state.yes_bid:
                 state.yes_bid = price
                 state.yes_bid_qty = delta
+                changed = True
         elif side == 'no' and delta > 0:
             if price > state.no_bid:
                 state.no_bid = price
                 state.no_bid_qty = delta
+                changed = True
 
-        state.last_update = datetime.now()
-        self._evaluate_opportunity(ticker)
+        state.last_update = time.monotonic()
+        if changed or ticker in self._requote:
+            self._evaluate_opportunity(ticker)
 
     def _evaluate_opportunity(self, ticker: str):
         """Evaluate trading opportunity"""
+        self._requote.discard(ticker)
         state = self.markets.get(ticker)
-        if not state or not state.best_bid or not state.best_ask:
+        if not state:
+            return
+
+        # Each of these is a computed property: read them once
+        best_bid, best_ask = state.best_bid, state.best_ask
+        if not best_bid or not best_ask:
             return
 
-        spread = state.spread
+        spread = best_ask - best_bid
         position = self.positions.get(ticker, 0)
 
-        has_pending = any(ticker in str(o) for o in self.open_orders.values())
+        if ticker in self._quoting:
+            return
+        has_pending = bool(self.pending_by_ticker.get(ticker))
 
         if spread >= self.config['aggressive_spread'] and not has_pending:
             self._execute_spread_capture(ticker, state)
@@ -237,84 +272,172 @@ class TradingBot:
         self._log(f"MARKET MAKE: {ticker} | Bid: {our_bid}c | Ask: {our_ask}c | Spread: {our_ask - our_bid}c")
         self._place_both_orders(ticker, our_bid, our_ask)
 
+    def _send_order_request(self, ticker: str, call, *args):
+        """
+        Run a blocking order request in a worker thread.
+
+        Called from the websocket handlers, so the request is scheduled
+        rather than awaited. The ticker is marked as quoting before the
+        request starts, so later deltas don't place a duplicate while it
+        is in flight. Returns the task, which resolves to the call's result.
+        """
+        self._quoting.add(ticker)
+
+        async def send():
+            request = asyncio.ensure_future(asyncio.to_thread(call, *args))
+            try:
+                await asyncio.shield(request)
+            except asyncio.CancelledError:
+                await asyncio.wait([request])  # Already sent: still report it
+            return request.result()
+
+        task = asyncio.create_task(send())
+        self._order_tasks.add(task)
+        task.add_done_callback(self._order_tasks.discard)
+        return task
+
     def _place_both_orders(self, ticker: str, bid_price: int, ask_price: int):
-        """Place buy and sell limit orders"""
+        """Place buy and sell limit orders in one batched request, off the event loop"""
         size = self.config['order_size']
+        legs = [('buy', bid_price), ('sell', ask_price)]
+
+        task = self._send_order_request(ticker, self.client.batch_create_orders, [
+            dict(ticker=ticker, side='yes', action=action, price=price, count=size)
+            for action, price in legs
+        ])
+        task.add_done_callback(lambda t: self._record_orders(ticker, legs, t))
 
+    def _record_orders(self, ticker: str, legs: list, task: asyncio.Task):
+        """Track the orders from a finished batch request"""
+        self._quoting.discard(ticker)
+        size = self.config['order_size']
         try:
-            buy = self.client.place_order(ticker, 'yes', 'buy', bid_price, size)
-            buy_id = buy.get('order', {}).get('order_id')
-            if buy_id:
-                self.open_orders[buy_id] = {'ticker': ticker, 'side': 'buy', 'price': bid_price, 'time': time.time()}
-                self.stats['orders_placed'] += 1
-                self._log(f"   OK BUY {size} @ {bid_price}c (timeout: {self.config['order_timeout']}s)")
-
-            sell = self.client.place_order(ticker, 'yes', 'sell', ask_price, size)
-            sell_id = sell.get('order', {}).get('order_id')
-            if sell_id:
-                self.open_orders[sell_id] = {'ticker': ticker, 'side': 'sell', 'price': ask_price, 'time': time.time()}
-                self.stats['orders_placed'] += 1
-                self._log(f"   OK SELL {size} @ {ask_price}c (timeout: {self.config['order_timeout']}s)")
-
-        except Exception as e:
+            results = task.result()
+        except (Exception, asyncio.CancelledError) as e:
             self._log(f"   x Order error: {e}")
+            results = []
+
+        if not any((r.get('order') or {}).get('order_id') for r in results):
+            self._requote.add(ticker)  # Nothing resting: retry on the next delta
+
+        for (action, price), result in zip(legs, results):
+            order_id = (result.get('order') or {}).get('order_id')
+            if not order_id:
+                self._log(f"   x {action.upper()} order error: {result.get('error')}")
+                continue
+            self._track_order(order_id, {'ticker': ticker, 'side': action, 'price': price, 'time': time.monotonic()})
+            self.stats['orders_placed'] += 1
+            self._log(f"   OK {action.upper()} {size} @ {price}c (timeout: {self.config['order_timeout']}s)")
+
+    def _track_order(self, order_id: str, order: dict):
+        """Record an open order, indexed by ticker for pending checks"""
+        self.open_orders[order_id] = order
+        self.pending_by_ticker.setdefault(order['ticker'], set()).add(order_id)
+
+    def _untrack_order(self, order_id: str) -> Optional[dict]:
+        """Forget a filled or canceled order; returns its record"""
+        order = self.open_orders.pop(order_id, None)
+        if order:
+            pending = self.pending_by_ticker.get(order['ticker'])
+            if pending:
+                pending.discard(order_id)
+                if not pending:
+                    del self.pending_by_ticker[order['ticker']]
+                    self._requote.add(order['ticker'])
+        return order
 
     def _close_position(self, ticker: str, state: MarketState, position: int):
-        """Close an open position"""
+        """Close an open position, off the event loop"""
         if position > 0:
-            price = state.best_bid
+            price, action = state.best_bid, 'sell'
             self._log(f"CLOSING LONG: {ticker} | Sell {position} @ {price}c")
-            try:
-                self.client.place_order(ticker, 'yes', 'sell', price, abs(position))
-            except:
-                pass
         elif position < 0:
-            price = state.best_ask
+            price, action = state.best_ask, 'buy'
             self._log(f"CLOSING SHORT: {ticker} | Buy {abs(position)} @ {price}c")
-            try:
-                self.client.place_order(ticker, 'yes', 'buy', price, abs(position))
-            except:
-                pass
+        else:
+            return
+
+        task = self._send_order_request(ticker, self.client.place_order,
+                                        ticker, 'yes', action, price, abs(position))
+        task.add_done_callback(lambda t: self._record_close(ticker, t))
+
+    def _record_close(self, ticker: str, task: asyncio.Task):
+        """Report a finished position-closing order"""
+        self._quoting.discard(ticker)
+        try:
+            task.result()
+        except (Exception, asyncio.CancelledError) as e:
+            self._log(f"   x Close order error: {e}")
 
     async def _manage_orders(self):
-        """Cancel stale orders and update positions"""
+        """
+        Cancel stale orders and update positions.
+
+        REST calls run in worker threads (over the client's keep-alive
+        session) so the websocket loop keeps processing deltas meanwhile.
+        """
         while self.running:
             try:
-                current_orders = self.client.get_resting_orders()
+                fetched_at = time.monotonic()
+                current_orders, positions = await asyncio.gather(
+                    asyncio.to_thread(self.client.get_resting_orders),
+                    asyncio.to_thread(self.client.get_positions_dict),
+                )
                 current_ids = {o['order_id'] for o in current_orders}
 
-                for oid in list(self.open_orders.keys()):
-                    if oid not in current_ids:
-                        order = self.open_orders.pop(oid)
+                for oid, order in list(self.open_orders.items()):
+                    # Orders placed while the fetch was in flight aren't in it yet
+                    if oid not in current_ids and order['time'] < fetched_at:
+                        self._untrack_order(oid)
                         self.stats['orders_filled'] += 1
                         self._log(f"   FILLED: {order['side'].upper()} @ {order['price']}c")
 
-                now = time.time()
-                for o in current_orders:
-                    oid = o['order_id']
-                    if oid in self.open_orders:
-                        age = now - self.open_orders[oid]['time']
-                        if age > self.config['order_timeout']:
-                            try:
-                                self.client.cancel_order(oid)
-                                self.open_orders.pop(oid, None)
-                                self.stats['orders_canceled'] += 1
-                                self._log(f"   CANCELED (stale): {o['action']} @ {o['yes_price']}c")
-                            except:
-                                pass
-
-                self.positions = self.client.get_positions_dict()
+                now = time.monotonic()
+                stale = [
+                    o for o in current_orders
+                    if o['order_id'] in self.open_orders
+                    and now - self.open_orders[o['order_id']]['time'] > self.config['order_timeout']
+                ]
+                await self._cancel_stale_orders(stale)
+
+                self._requote.update(
+                    t for t in positions.keys() | self.positions.keys()
+                    if positions.get(t) != self.positions.get(t)
+                )
+                self.positions = positions
 
             except Exception as e:
                 self._log(f"Order manager error: {e}")
 
             await asyncio.sleep(self.config['refresh_interval'])
 
+    async def _cancel_stale_orders(self, stale: list):
+        """Cancel timed-out resting orders, up to 20 per batched request"""
+        for i in range(0, len(stale), MAX_BATCH_ORDERS):
+            chunk = stale[i:i + MAX_BATCH_ORDERS]
+            try:
+                results = await asyncio.to_thread(
+                    self.client.batch_cancel_orders, [o['order_id'] for o in chunk]
+                )
+            except Exception as e:
+                self._log(f"   x Cancel error: {e}")
+                continue
+
+            for o, result in zip(chunk, results):
+                if result.get('error'):
+                    continue
+                self._untrack_order(o['order_id'])
+                self.stats['orders_canceled'] += 1
+                self._log(f"   CANCELED (stale): {o['action']} @ {o['yes_price']}c")
+
     async def _refresh_markets(self):
         """Periodically refresh market list"""
         while self.running:
+            # run() has just fetched the list, so wait before the first refresh
+            await asyncio.sleep(30)
+
             try:
-                markets = self.client.fetch_active_markets(limit=50)
+                markets = await asyncio.to_thread(self.client.fetch_active_markets, limit=50)
                 self.active_tickers = [m['ticker'] for m in markets[:10]]
 
                 if markets:
@@ -326,17 +449,15 @@ class TradingBot:
             except Exception as e:
                 self._log(f"Market refresh error: {e}")
 
-            await asyncio.sleep(30)
-
     def _log(self, msg: str):
         """Log with timestamp"""
-        ts = datetime.now().strftime("%H:%M:%S")
-        print(f"[{ts}] {msg}", flush=True)
+        logger.info(msg)
 
-    def _print_status(self):
+    def _print_status(self, balance: float = None):
         """Print current status"""
         runtime = (datetime.now() - self.start_time).seconds
-        balance = self.client.get_balance_dollars()
+        if balance is None:
+            balance = self.client.get_balance_dollars()
 
         print("\n" + "=" * 60)
         print(f"STATUS | Runtime: {runtime}s | Balance: ${balance:.2f}")
@@ -372,43 +493,57 @@ class TradingBot:
         async def print_status_loop():
             while self.running:
                 await asyncio.sleep(30)
-                self._print_status()
+                balance = await asyncio.to_thread(self.client.get_balance_dollars)
+                self._print_status(balance)
         asyncio.create_task(print_status_loop())
 
-        ws_headers = auth.get_ws_auth_headers(self.api_key, self.private_key, config.WS_PATH)
+        await self._ws_loop()
+
+    async def _ws_loop(self):
+        """
+        Stream orderbooks for the active markets, reconnecting on error.
+
+        Tickers are re-read from active_tickers on every connect, so
+        reconnects pick up the latest market refresh.
+        """
+        sub_payload = None  # (tickers, encoded subscribe), reused across reconnects
 
         while self.running:
             try:
-                self._log("Connecting to WebSocket...")
-                async with websockets.connect(config.WS_URL, additional_headers=ws_headers) as ws:
-                    self._log("OK Connected!")
-
+                tickers = list(self.active_tickers)
+                if sub_payload is None or sub_payload[0] != tickers:
                     sub = {
                         "id": 1,
                         "cmd": "subscribe",
                         "params": {
                             "channels": ["orderbook_delta"],
-                            "market_tickers": self.active_tickers
+                            "market_tickers": tickers
                         }
                     }
-                    await ws.send(json.dumps(sub))
-                    self._log(f"Subscribed to {len(self.active_tickers)} markets")
+                    sub_payload = (tickers, fastjson.dumps(sub))
+                ws_headers = auth.get_ws_auth_headers(self.api_key, self.private_key, config.WS_PATH)
 
+                self._log("Connecting to WebSocket...")
+                async with websockets.connect(config.WS_URL, additional_headers=ws_headers,
+                                              **config.WS_CONNECT_OPTIONS) as ws:
+                    self._log("OK Connected!")
+
+                    await ws.send(sub_payload[1])
+                    self._log(f"Subscribed to {len(tickers)} markets")
+
+                    handlers = self.handlers
                     async for msg in ws:
                         if not self.running:
                             break
 
                         try:
-                            data = json.loads(msg)
-                            msg_type = data.get('type')
-
-                            if msg_type == 'orderbook_snapshot':
-                                self.process_snapshot(data.get('msg', {}))
-                            elif msg_type == 'orderbook_delta':
-                                self.process_delta(data.get('msg', {}))
+                            data = fastjson.loads(msg)
+                        except fastjson.JSONDecodeError:
+                            continue
 
-                        except json.JSONDecodeError:
-                            pass
+                        handler = handlers.get(data.get('type'))
+                        if handler is not None:
+                            handler(data.get('msg', {}))
 
             except Exception as e:
                 self._log(f"WebSocket error: {e}")
@@ -444,4 +579,4 @@ if __name__ == "__main__":
     sys.stdout.reconfigure(line_buffering=True)
     print("Starting Kalshi Trading Bot...", flush=True)
     print("Press Ctrl+C to stop\n", flush=True)
-    asyncio.run(main())
+    run_event_loop(main())
@@ -1,16 +1,16 @@
 """
 Kalshi Multi-Threaded Trading Bot
 ---------------------------------
-Each contract runs in its own thread for continuous parallel scanning.
+Each contract runs in its own asyncio task for continuous parallel scanning.
 """
 
 import asyncio
-import json
+import logging
+import signal
 import time
-import threading
 from datetime import datetime
+from itertools import islice
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
 
 try:
     import websockets
@@ -24,7 +24,27 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from kalshi import config
 from kalshi.client import KalshiClient
+from kalshi.batcher import OrderBatcher
 from kalshi import auth
+from kalshi import fastjson
+from kalshi.runtime import start_log_listener, run_event_loop
+
+
+# Fills arrive over the websocket; REST is only polled to catch missed events
+RECONCILE_INTERVAL = 30
+
+# Seconds a trader waits for a book change before re-checking anyway:
+# short while it has orders to expire, longer while idle
+ORDER_CHECK_INTERVAL = 0.5
+IDLE_CHECK_INTERVAL = 2.0
+
+# Seconds a stopping trader gets to finish its current step before it is cancelled
+TRADER_STOP_TIMEOUT = 5
+
+# Hard limit (seconds) on stop(): stopping traders, canceling orders, final status
+SHUTDOWN_TIMEOUT = 15
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -35,7 +55,7 @@ class MarketState:
     yes_ask: int = 0
     no_bid: int = 0
     no_ask: int = 0
-    last_update: float = 0
+    last_update: float = 0  # Monotonic seconds
 
     @property
     def best_bid(self) -> int:
@@ -49,156 +69,269 @@ class MarketState:
 
     @property
     def spread(self) -> int:
-        if self.best_bid and self.best_ask:
-            return self.best_ask - self.best_bid
+        best_bid, best_ask = self.best_bid, self.best_ask
+        if best_bid and best_ask:
+            return best_ask - best_bid
         return 0
 
     @property
     def mid(self) -> float:
-        return (self.best_bid + self.best_ask) / 2 if self.best_bid and self.best_ask else 0
+        best_bid, best_ask = self.best_bid, self.best_ask
+        return (best_bid + best_ask) / 2 if best_bid and best_ask else 0
 
 
-class MarketTrader(threading.Thread):
+class MarketTrader:
     """
-    Individual thread for trading a single market.
-    Each market gets its own trader thread that continuously monitors and trades.
+    Individual task for trading a single market.
+    Each market gets its own trader task that continuously monitors and trades.
+    Blocking REST calls run in worker threads so the event loop stays free.
     """
 
     def __init__(self, ticker: str, bot: 'TradingBotMT'):
-        super().__init__(daemon=True)
         self.ticker = ticker
         self.bot = bot
         self.state = MarketState(ticker=ticker)
         self.running = True
+        self.task = None
+        self.update_event = asyncio.Event()  # Set when the book or our orders change
         self.open_orders = {}
+        self.early_fills = {}  # order_id -> contracts filled before the order was recorded
         self.stats = {'placed': 0, 'filled': 0, 'canceled': 0}
         self.last_trade_time = 0
+        self.last_reconcile = 0
 
-    def log(self, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        print(f"[{ts}] [{self.ticker[:25]}] {msg}", flush=True)
+        # Strategy parameters, read once (bot config is fixed while running)
+        self.min_spread = bot.config['min_spread']
+        self.aggressive_spread = bot.config['aggressive_spread']
+        self.edge = bot.config['edge']
+        self.order_size = bot.config['order_size']
+        self.order_timeout = bot.config['order_timeout']
 
-    def update_state(self, yes_bid=None, no_bid=None):
-        """Update market state from websocket data"""
-        if yes_bid is not None:
-            self.state.yes_bid = yes_bid
-        if no_bid is not None:
-            self.state.no_bid = no_bid
-        self.state.last_update = time.time()
+    def log(self, msg: str):
+        logger.info("[%s] %s", self.ticker[:25], msg)
 
-    def place_order(self, side: str, action: str, price: int, count: int) -> dict:
-        """Place order through the main bot"""
-        return self.bot.place_order(self.ticker, side, action, price, count)
+    def _count(self, key: str):
+        """Bump one of this trader's order stats and the bot-wide total"""
+        self.stats[key] += 1
+        self.bot.totals[key] += 1
 
-    def cancel_order(self, order_id: str):
+    def update_state(self, yes_bid=None, no_bid=None):
+        """Update market state from websocket data, waking the trader on a change"""
+        state = self.state
+        changed = False
+        if yes_bid is not None and yes_bid != state.yes_bid:
+            state.yes_bid = yes_bid
+            changed = True
+        if no_bid is not None and no_bid != state.no_bid:
+            state.no_bid = no_bid
+            changed = True
+        state.last_update = time.monotonic()
+        if changed:
+            self.update_event.set()
+
+    async def place_orders(self, orders: list) -> list:
+        """Place a batch of orders through the main bot"""
+        return await self.bot.batcher.submit(orders)
+
+    async def cancel_order(self, order_id: str):
         """Cancel order through the main bot"""
-        return self.bot.cancel_order(order_id)
+        return await asyncio.to_thread(self.bot.cancel_order, order_id)
 
-    def get_open_orders(self) -> list:
+    async def get_open_orders(self) -> list:
         """Get open orders for this ticker"""
-        try:
-            all_orders = self.bot.get_orders()
-            return [o for o in all_orders if o.get('ticker') == self.ticker]
-        except:
-            return []
+        # Filtered by the exchange, so traders don't each download every order
+        return await asyncio.to_thread(self.bot.get_orders, self.ticker)
 
-    def execute_trade(self):
+    async def execute_trade(self):
         """Execute market making trade if opportunity exists"""
+        if not self.running:
+            return
+
         state = self.state
         spread = state.spread
 
-        if spread < self.bot.config['min_spread']:
+        if spread < self.min_spread:
             return
 
-        if time.time() - self.last_trade_time < 2:
+        if time.monotonic() - self.last_trade_time < 2:
             return
 
-        if spread >= self.bot.config['aggressive_spread']:
-            our_bid = int(state.mid - 2)
-            our_ask = int(state.mid + 2)
-            self.log(f"SPREAD {spread}c | Mid:{state.mid:.0f}c | BUY@{our_bid}c SELL@{our_ask}c")
+        if spread >= self.aggressive_spread:
+            mid = state.mid
+            our_bid = int(mid - 2)
+            our_ask = int(mid + 2)
+            self.log(f"SPREAD {spread}c | Mid:{mid:.0f}c | BUY@{our_bid}c SELL@{our_ask}c")
         else:
-            our_bid = state.best_bid + self.bot.config['edge']
-            our_ask = state.best_ask - self.bot.config['edge']
+            our_bid = state.best_bid + self.edge
+            our_ask = state.best_ask - self.edge
             self.log(f"SPREAD {spread}c | BUY@{our_bid}c SELL@{our_ask}c")
 
         if our_ask <= our_bid:
             return
 
-        size = self.bot.config['order_size']
+        size = self.order_size
+        legs = [('buy', our_bid), ('sell', our_ask)]
 
+        send = asyncio.ensure_future(self.place_orders([
+            dict(ticker=self.ticker, side='yes', action=action, price=price, count=size)
+            for action, price in legs
+        ]))
+        cancelled = False
         try:
-            buy = self.place_order('yes', 'buy', our_bid, size)
-            buy_id = buy.get('order', {}).get('order_id')
-            if buy_id:
-                self.open_orders[buy_id] = {'side': 'buy', 'price': our_bid, 'time': time.time()}
-                self.stats['placed'] += 1
-
-            sell = self.place_order('yes', 'sell', our_ask, size)
-            sell_id = sell.get('order', {}).get('order_id')
-            if sell_id:
-                self.open_orders[sell_id] = {'side': 'sell', 'price': our_ask, 'time': time.time()}
-                self.stats['placed'] += 1
-
-            self.last_trade_time = time.time()
+            await asyncio.shield(send)
+        except asyncio.CancelledError:
+            # Stopping: wait for the request already sent so its orders are
+            # tracked and canceled by stop()
+            cancelled = True
+            await asyncio.wait([send])
 
+        try:
+            results = send.result()
         except Exception as e:
             self.log(f"x Order error: {e}")
-
-    def manage_orders(self):
-        """Cancel stale orders and track fills"""
+            results = []
+
+        now = time.monotonic()
+        for (action, price), result in zip(legs, results):
+            order_id = (result.get('order') or {}).get('order_id')
+            if not order_id:
+                self.log(f"x {action.upper()} order error: {result.get('error')}")
+                continue
+            self.open_orders[order_id] = {'side': action, 'price': price, 'time': now, 'remaining': size}
+            self._count('placed')
+            filled = self.early_fills.pop(order_id, 0)
+            if filled:
+                self._apply_fill(order_id, filled)
+        # Fills for orders that were never recorded here aren't ours to track
+        self.early_fills.clear()
+
+        self.last_trade_time = now
+
+        if cancelled:
+            raise asyncio.CancelledError
+
+    def on_fill(self, fill: dict):
+        """
+        Apply a websocket fill event to one of our open orders.
+
+        A fill can arrive while the batch that placed the order is still
+        awaiting its response; it is held until execute_trade records it.
+        """
+        order_id = fill.get('order_id')
+        count = fill.get('count', 0)
+        if order_id in self.open_orders:
+            self._apply_fill(order_id, count)
+        elif order_id:
+            self.early_fills[order_id] = self.early_fills.get(order_id, 0) + count
+
+    def _apply_fill(self, order_id: str, count: int):
+        """Count down an open order, dropping it once fully filled"""
+        order = self.open_orders[order_id]
+        order['remaining'] -= count
+        if order['remaining'] <= 0:
+            del self.open_orders[order_id]
+            self._count('filled')
+            self.log(f"FILLED: {order['side'].upper()} @ {order['price']}c")
+            self.update_event.set()  # May be free to quote again
+
+    async def reconcile_orders(self):
+        """
+        Treat orders no longer resting on the exchange as filled.
+
+        Fetch errors propagate, so a failed request is never mistaken for
+        every order having filled.
+        """
+        fetched_at = time.monotonic()
+        current_ids = {o['order_id'] for o in await self.get_open_orders()}
+        self.last_reconcile = fetched_at
+
+        # Orders placed after the fetch started can't be in it yet
+        filled = [oid for oid, order in self.open_orders.items()
+                  if oid not in current_ids and order['time'] < fetched_at]
+        for oid in filled:
+            order = self.open_orders.pop(oid)
+            self._count('filled')
+            self.log(f"FILLED: {order['side'].upper()} @ {order['price']}c")
+
+    async def manage_orders(self):
+        """Cancel stale orders; fills are tracked from websocket events"""
         try:
-            current_orders = self.get_open_orders()
-            current_ids = {o['order_id'] for o in current_orders}
-
-            for oid in list(self.open_orders.keys()):
-                if oid not in current_ids:
-                    order = self.open_orders.pop(oid)
-                    self.stats['filled'] += 1
-                    self.log(f"FILLED: {order['side'].upper()} @ {order['price']}c")
-
-            now = time.time()
-            timeout = self.bot.config['order_timeout']
-            for o in current_orders:
-                oid = o['order_id']
-                if oid in self.open_orders:
-                    age = now - self.open_orders[oid]['time']
-                    if age > timeout:
-                        try:
-                            self.cancel_order(oid)
-                            self.open_orders.pop(oid, None)
-                            self.stats['canceled'] += 1
-                        except:
-                            pass
+            now = time.monotonic()
+            if self.open_orders and now - self.last_reconcile >= RECONCILE_INTERVAL:
+                await self.reconcile_orders()
+
+            # open_orders is in placement order, so the stale ones are a prefix
+            timeout = self.order_timeout
+            stale = []
+            for oid, order in self.open_orders.items():
+                if now - order['time'] <= timeout:
+                    break
+                stale.append(oid)
+
+            for oid in stale:
+                try:
+                    await self.cancel_order(oid)
+                    self.open_orders.pop(oid, None)
+                    self._count('canceled')
+                except:
+                    # Likely filled already; check against REST next tick
+                    self.last_reconcile = 0
 
         except Exception as e:
             pass
 
-    def run(self):
-        """Main thread loop - continuously monitor and trade"""
-        self.log("Thread started")
+    def start(self):
+        """Schedule the trader loop on the running event loop"""
+        self.task = asyncio.create_task(self.trader_loop())
+
+    async def wait_for_update(self):
+        """Sleep until the book changes or the next periodic check is due"""
+        timeout = ORDER_CHECK_INTERVAL if self.open_orders else IDLE_CHECK_INTERVAL
+        try:
+            await asyncio.wait_for(self.update_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.update_event.clear()
+
+    async def trader_loop(self):
+        """Main task loop - continuously monitor and trade"""
+        self.log("Trader started")
 
         while self.running:
             try:
-                self.manage_orders()
+                await self.manage_orders()
 
                 if len(self.open_orders) == 0:
-                    self.execute_trade()
+                    await self.execute_trade()
 
-                time.sleep(0.5)
+                await self.wait_for_update()
 
             except Exception as e:
                 self.log(f"Error: {e}")
-                time.sleep(1)
+                await asyncio.sleep(1)
+
+        self.log("Trader stopped")
 
-        self.log("Thread stopped")
+    async def stop(self):
+        """
+        Stop the task and cancel its open orders in one request.
 
-    def stop(self):
-        """Stop the thread"""
+        The loop is asked to exit rather than cancelled outright, so a quote
+        in flight is recorded before its orders are canceled. Only a task
+        still busy after TRADER_STOP_TIMEOUT is cancelled.
+        """
         self.running = False
-        for oid in list(self.open_orders.keys()):
+        self.update_event.set()
+        if self.task:
             try:
-                self.cancel_order(oid)
+                await asyncio.wait_for(asyncio.shield(self.task), TRADER_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.task.cancel()
+                await asyncio.gather(self.task, return_exceptions=True)
+
+        if self.open_orders:
+            try:
+                await asyncio.to_thread(self.bot.cancel_orders, list(self.open_orders))
             except:
                 pass
 
@@ -206,26 +339,45 @@ class MarketTrader(threading.Thread):
 class TradingBotMT:
     """
     Multi-Threaded Trading Bot
-    - Main thread handles WebSocket connection and market discovery
-    - Each market gets its own trading thread
+    - Main task handles WebSocket connection and market discovery
+    - Each market gets its own trading task
     """
 
     def __init__(self, api_key: str = None, private_key_path: str = None):
         self.api_key = api_key or config.API_KEY
         self.private_key_path = private_key_path or config.PRIVATE_KEY_PATH
         self.private_key = auth.load_private_key(self.private_key_path)
-        self.client = KalshiClient(self.api_key, self.private_key_path)
-
-        # Thread management
-        self.traders: dict[str, MarketTrader] = {}
-        self.lock = threading.Lock()
 
         # Configuration
         self.config = dict(config.DEFAULT_CONFIG)
 
+        # Every trader may have a REST call in flight at once; give each a
+        # pooled keep-alive connection instead of opening extras per call
+        pool_size = max(config.HTTP_POOL_SIZE, self.config['max_threads'])
+        self.client = KalshiClient(self.api_key, self.private_key_path, pool_size=pool_size)
+
+        # Trader management (all on the event loop, so no locking)
+        self.traders: dict[str, MarketTrader] = {}
+        self.totals = {'placed': 0, 'filled': 0, 'canceled': 0}  # Across all traders
+
+        # Traders quoting at the same moment share one batched order request
+        self.batcher = OrderBatcher(self.client)
+
+        # Websocket handlers keyed by message type
+        self.handlers = {
+            'orderbook_snapshot': self._handle_snapshot,
+            'orderbook_delta': self._handle_delta,
+            'fill': self._handle_fill,
+        }
+
+        # (tickers, encoded subscribe), reused across reconnects
+        self._sub_payload = None
+
         self.running = True
         self.start_time = datetime.now()
 
+        start_log_listener(logger)
+
     # ==================== REST API ====================
 
     def get_balance(self) -> float:
@@ -237,39 +389,40 @@ class TradingBotMT:
     def cancel_order(self, order_id: str):
         return self.client.cancel_order(order_id)
 
-    def get_orders(self) -> list:
-        return self.client.get_resting_orders()
+    def cancel_orders(self, order_ids: list) -> list:
+        return self.client.batch_cancel_orders(order_ids)
+
+    def get_orders(self, ticker: str = None) -> list:
+        return self.client.get_resting_orders(ticker)
 
     def fetch_markets(self) -> list:
         return self.client.fetch_active_markets(limit=100)
 
-    # ==================== Thread Management ====================
+    # ==================== Trader Management ====================
 
     def start_trader(self, ticker: str):
-        """Start a trading thread for a market"""
-        with self.lock:
-            if ticker in self.traders:
-                return
+        """Start a trading task for a market"""
+        if ticker in self.traders:
+            return
 
-            if len(self.traders) >= self.config['max_threads']:
-                return
+        if len(self.traders) >= self.config['max_threads']:
+            return
 
-            trader = MarketTrader(ticker, self)
-            self.traders[ticker] = trader
-            trader.start()
+        trader = MarketTrader(ticker, self)
+        self.traders[ticker] = trader
+        trader.start()
 
-    def stop_trader(self, ticker: str):
-        """Stop a trading thread"""
-        with self.lock:
-            if ticker in self.traders:
-                self.traders[ticker].stop()
-                del self.traders[ticker]
+    async def stop_trader(self, ticker: str):
+        """Stop a trading task"""
+        trader = self.traders.pop(ticker, None)
+        if trader:
+            await trader.stop()
 
     def update_market(self, ticker: str, yes_bid=None, no_bid=None):
         """Update market state from websocket"""
-        with self.lock:
-            if ticker in self.traders:
-                self.traders[ticker].update_state(yes_bid=yes_bid, no_bid=no_bid)
+        trader = self.traders.get(ticker)
+        if trader:
+            trader.update_state(yes_bid=yes_bid, no_bid=no_bid)
 
     # ==================== WebSocket ====================
 
@@ -279,39 +432,41 @@ class TradingBotMT:
 
         ws_headers = auth.get_ws_auth_headers(self.api_key, self.private_key, config.WS_PATH)
 
-        async with websockets.connect(config.WS_URL, additional_headers=ws_headers) as ws:
-            self._log(f"OK Connected! Subscribing to {len(tickers)} markets...")
-
+        if self._sub_payload is None or self._sub_payload[0] != tickers:
             sub = {
                 "id": 1,
                 "cmd": "subscribe",
                 "params": {
-                    "channels": ["orderbook_delta"],
+                    "channels": ["orderbook_delta", "fill"],
                     "market_tickers": tickers
                 }
             }
-            await ws.send(json.dumps(sub))
+            self._sub_payload = (tickers, fastjson.dumps(sub))
+
+        async with websockets.connect(config.WS_URL, additional_headers=ws_headers,
+                                      **config.WS_CONNECT_OPTIONS) as ws:
+            self._log(f"OK Connected! Subscribing to {len(tickers)} markets...")
+
+            await ws.send(self._sub_payload[1])
 
             for ticker in tickers:
                 self.start_trader(ticker)
 
-            self._log(f"Started {len(self.traders)} trading threads")
+            self._log(f"Started {len(self.traders)} trading tasks")
 
+            handlers = self.handlers
             async for msg in ws:
                 if not self.running:
                     break
 
                 try:
-                    data = json.loads(msg)
-                    msg_type = data.get('type')
-
-                    if msg_type == 'orderbook_snapshot':
-                        self._handle_snapshot(data.get('msg', {}))
-                    elif msg_type == 'orderbook_delta':
-                        self._handle_delta(data.get('msg', {}))
+                    data = fastjson.loads(msg)
+                except fastjson.JSONDecodeError:
+                    continue
 
-                except json.JSONDecodeError:
-                    pass
+                handler = handlers.get(data.get('type'))
+                if handler is not None:
+                    handler(data.get('msg', {}))
 
     def _handle_snapshot(self, data: dict):
         """Handle orderbook snapshot"""
@@ -319,11 +474,9 @@ class TradingBotMT:
         if not ticker:
             return
 
-        yes_orders = data.get('yes', [])
-        no_orders = data.get('no', [])
-
-        yes_bid = yes_orders[0][0] if yes_orders else 0
-        no_bid = no_orders[0][0] if no_orders else 0
+        # Levels are [price, qty]; take the best (highest) price in one pass
+        yes_bid = max((level[0] for level in data.get('yes') or ()), default=0)
+        no_bid = max((level[0] for level in data.get('no') or ()), default=0)
 
         self.update_market(ticker, yes_bid=yes_bid, no_bid=no_bid)
 
@@ -341,26 +494,30 @@ class TradingBotMT:
         elif side == 'no':
             self.update_market(ticker, no_bid=price)
 
+    def _handle_fill(self, data: dict):
+        """Route a fill on one of our orders to its market's trader"""
+        trader = self.traders.get(data.get('market_ticker'))
+        if trader:
+            trader.on_fill(data)
+
     def _log(self, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        print(f"[{ts}] [MAIN] {msg}", flush=True)
+        logger.info("[MAIN] %s", msg)
 
-    def print_status(self):
-        """Print current status"""
+    def print_status(self, balance: float = None):
+        """Print current status; pass balance to skip the blocking fetch"""
         runtime = (datetime.now() - self.start_time).seconds
-        balance = self.get_balance()
+        if balance is None:
+            balance = self.get_balance()
 
-        total_placed = sum(t.stats['placed'] for t in self.traders.values())
-        total_filled = sum(t.stats['filled'] for t in self.traders.values())
-        total_canceled = sum(t.stats['canceled'] for t in self.traders.values())
+        totals = self.totals
 
         print("\n" + "=" * 70, flush=True)
         print(f"STATUS | Runtime: {runtime}s | Balance: ${balance:.2f}", flush=True)
-        print(f"Active threads: {len(self.traders)}", flush=True)
-        print(f"Orders: {total_placed} placed | {total_filled} filled | {total_canceled} canceled", flush=True)
+        print(f"Active traders: {len(self.traders)}", flush=True)
+        print(f"Orders: {totals['placed']} placed | {totals['filled']} filled | {totals['canceled']} canceled", flush=True)
         print("=" * 70, flush=True)
 
-        for ticker, trader in list(self.traders.items())[:10]:
+        for ticker, trader in islice(self.traders.items(), 10):
             spread = trader.state.spread
             print(f"   {ticker[:35]}: spread={spread}c | orders={trader.stats['placed']}", flush=True)
         print("", flush=True)
@@ -393,9 +550,11 @@ class TradingBotMT:
         async def status_loop():
             while self.running:
                 await asyncio.sleep(30)
-                self.print_status()
+                balance = await asyncio.to_thread(self.get_balance)
+                self.print_status(balance)
 
         asyncio.create_task(status_loop())
+        self._install_signal_handlers()
 
         while self.running:
             try:
@@ -405,15 +564,47 @@ class TradingBotMT:
                 self._log("Reconnecting in 5 seconds...")
                 await asyncio.sleep(5)
 
-    def stop(self):
-        """Stop the bot and all threads"""
+    def _install_signal_handlers(self):
+        """
+        Stop on SIGINT/SIGTERM by cancelling the running task.
+
+        The cancellation reaches run() at its current await, and main()
+        then runs stop() to cancel traders and their orders. The default
+        handlers are restored after the first signal, so a second one
+        kills the process if cleanup hangs.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+
+        def request_stop():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+                signal.signal(sig, signal.SIG_DFL)
+            self._log("Shutdown requested (signal again to force quit)")
+            self.running = False
+            task.cancel()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, request_stop)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C cancels the main task instead
+
+    async def stop(self):
+        """Stop the bot and all trader tasks, giving up after SHUTDOWN_TIMEOUT"""
         self._log("Stopping bot...")
         self.running = False
 
-        for ticker in list(self.traders.keys()):
-            self.stop_trader(ticker)
+        try:
+            await asyncio.wait_for(self._stop_traders(), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._log(f"x Shutdown timed out after {SHUTDOWN_TIMEOUT}s; some orders may still be open")
+
+    async def _stop_traders(self):
+        """Stop every trader, canceling their orders, then print final status"""
+        await asyncio.gather(*[self.stop_trader(ticker) for ticker in self.traders])
 
-        self.print_status()
+        self.print_status(await asyncio.to_thread(self.get_balance))
 
 
 async def main():
@@ -421,11 +612,13 @@ async def main():
 
     try:
         await bot.run()
-    except KeyboardInterrupt:
-        bot.stop()
+    except asyncio.CancelledError:
+        pass  # Interrupted by a signal or Ctrl+C
+    finally:
+        await bot.stop()
 
 
 if __name__ == "__main__":
     print("Starting Multi-Threaded Kalshi Trading Bot...", flush=True)
     print("Press Ctrl+C to stop\n", flush=True)
-    asyncio.run(main())
+    run_event_loop(main())
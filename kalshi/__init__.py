@@ -4,10 +4,12 @@ Kalshi API Package
 Core components for interacting with the Kalshi API.
 """
 
-from .config import API_KEY, PRIVATE_KEY_PATH, REST_URL, WS_URL, WS_PATH, DEFAULT_CONFIG
+from .config import API_KEY, PRIVATE_KEY_PATH, REST_URL, WS_URL, WS_PATH, WS_CONNECT_OPTIONS, HTTP_POOL_SIZE, HTTP_TIMEOUT, DEFAULT_CONFIG
 from .auth import load_private_key, sign_request, get_auth_headers, get_ws_auth_headers
-from .client import KalshiClient
+from .client import KalshiClient, MAX_BATCH_ORDERS
+from .batcher import OrderBatcher, ORDER_BATCH_WINDOW
 from .websocket import KalshiWebSocket, fetch_active_markets
+from .runtime import start_log_listener, run_event_loop
 
 __all__ = [
     # Config
@@ -16,6 +18,9 @@ __all__ = [
     'REST_URL',
     'WS_URL',
     'WS_PATH',
+    'WS_CONNECT_OPTIONS',
+    'HTTP_POOL_SIZE',
+    'HTTP_TIMEOUT',
     'DEFAULT_CONFIG',
     # Auth
     'load_private_key',
@@ -24,7 +29,14 @@ __all__ = [
     'get_ws_auth_headers',
     # Client
     'KalshiClient',
+    'MAX_BATCH_ORDERS',
+    # Batcher
+    'OrderBatcher',
+    'ORDER_BATCH_WINDOW',
     # WebSocket
     'KalshiWebSocket',
     'fetch_active_markets',
+    # Runtime
+    'start_log_listener',
+    'run_event_loop',
 ]
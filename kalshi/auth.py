@@ -10,6 +10,13 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 
+# Signing parameters are immutable, so build them once rather than per request
+_PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.DIGEST_LENGTH
+)
+_SHA256 = hashes.SHA256()
+
 
 def load_private_key(path: str):
     """Load RSA private key from file"""
@@ -24,14 +31,7 @@ def load_private_key(path: str):
 def sign_request(private_key, timestamp: str, method: str, path: str) -> str:
     """Create signature for API request using RSA-PSS"""
     message = f"{timestamp}{method}{path}"
-    signature = private_key.sign(
-        message.encode('utf-8'),
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.DIGEST_LENGTH
-        ),
-        hashes.SHA256()
-    )
+    signature = private_key.sign(message.encode('utf-8'), _PSS_PADDING, _SHA256)
     return base64.b64encode(signature).decode('utf-8')
 
 
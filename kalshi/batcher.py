@@ -0,0 +1,100 @@
+"""
+Kalshi Order Batcher
+--------------------
+Coalesces orders from concurrent tasks into batched create requests.
+"""
+
+import asyncio
+import logging
+
+from .client import KalshiClient, MAX_BATCH_ORDERS
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for more orders before sending a partial batch
+ORDER_BATCH_WINDOW = 0.01
+
+
+class OrderBatcher:
+    """
+    Send orders submitted by concurrent tasks as batched requests.
+
+    Orders submitted within ORDER_BATCH_WINDOW of each other go out
+    together, so simultaneous quotes cost one HTTP request rather than one
+    per market. Each submit() call's orders always share a request, so a
+    quote's legs are never split between a request that succeeded and one
+    that failed.
+    """
+
+    def __init__(self, client: KalshiClient, window: float = ORDER_BATCH_WINDOW):
+        self.client = client
+        self.window = window
+        self._queued: list[tuple[list, asyncio.Future]] = []
+        self._flush_task = None
+
+    async def submit(self, orders: list) -> list:
+        """
+        Queue orders for the next batched request and wait for their results.
+
+        Returns one result per order, as batch_create_orders does. Orders
+        placed for a caller that stopped waiting are canceled, since
+        nobody will track them.
+        """
+        if len(orders) > MAX_BATCH_ORDERS:
+            raise ValueError(f"Cannot batch {len(orders)} orders; limit is {MAX_BATCH_ORDERS}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queued.append((orders, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """Send queued orders, keeping each caller's orders in one request"""
+        await asyncio.sleep(self.window)
+        queued, self._queued = self._queued, []
+        self._flush_task = None
+
+        batches, current, size = [], [], 0
+        for orders, future in queued:
+            if current and size + len(orders) > MAX_BATCH_ORDERS:
+                batches.append(current)
+                current, size = [], 0
+            current.append((orders, future))
+            size += len(orders)
+        if current:
+            batches.append(current)
+
+        await asyncio.gather(*(self._send(batch) for batch in batches))
+
+    async def _send(self, batch: list):
+        """Place one batched request and hand each caller its results"""
+        try:
+            results = await asyncio.to_thread(
+                self.client.batch_create_orders, [order for orders, _ in batch for order in orders]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        orphaned = []  # Placed for callers that stopped waiting
+        start = 0
+        for orders, future in batch:
+            placed = results[start:start + len(orders)]
+            start += len(orders)
+            if not future.done():
+                future.set_result(placed)
+                continue
+            for result in placed:
+                order_id = (result.get('order') or {}).get('order_id')
+                if order_id:
+                    orphaned.append(order_id)
+
+        if orphaned:
+            # Nobody will track these, so don't leave them resting
+            try:
+                await asyncio.to_thread(self.client.batch_cancel_orders, orphaned)
+            except Exception as e:
+                logger.error("x Failed to cancel untracked orders %s: %s", orphaned, e)
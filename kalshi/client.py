@@ -4,23 +4,70 @@ Kalshi REST API Client
 Client for interacting with Kalshi's REST API.
 """
 
+import heapq
+import time
 import requests
+from requests.adapters import HTTPAdapter
+
 from . import config
+from . import fastjson
 from . import auth
 
 
+# Largest page the /markets endpoint will return
+MARKETS_PAGE_SIZE = 1000
+
+# Most orders Kalshi accepts in one batched create or cancel request
+MAX_BATCH_ORDERS = 20
+
+# Order body field that carries the limit price for each contract side
+_PRICE_FIELDS = {"yes": "yes_price", "no": "no_price"}
+
+
 class KalshiClient:
     """Client for interacting with Kalshi's REST API"""
 
-    def __init__(self, api_key: str = None, private_key_path: str = None):
+    def __init__(self, api_key: str = None, private_key_path: str = None, pool_size: int = None):
         self.api_key = api_key or config.API_KEY
         self.private_key_path = private_key_path or config.PRIVATE_KEY_PATH
         self.private_key = auth.load_private_key(self.private_key_path)
         self.base_url = config.REST_URL
 
+        # Persistent session: reuses TCP/TLS connections across requests,
+        # with enough pooled connections for concurrent callers
+        self.session = requests.Session()
+        pool_size = pool_size or config.HTTP_POOL_SIZE
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+        # Headers that are the same on every request; signing fills in the rest
+        self._base_headers = {
+            "KALSHI-ACCESS-KEY": self.api_key,
+            "Content-Type": "application/json"
+        }
+
+        # Signatures for the current millisecond, keyed by (timestamp, method, path)
+        self._sig_timestamp = None
+        self._signatures = {}
+
     def _get_headers(self, method: str, path: str) -> dict:
         """Generate authenticated headers"""
-        return auth.get_auth_headers(self.api_key, self.private_key, method, path)
+        timestamp = str(int(time.time() * 1000))
+        # Same-millisecond calls to one endpoint reuse the signature
+        if timestamp != self._sig_timestamp:
+            self._sig_timestamp = timestamp
+            self._signatures = {}
+
+        signatures = self._signatures
+        key = (timestamp, method, path)
+        signature = signatures.get(key)
+        if signature is None:
+            signature = auth.sign_request(self.private_key, timestamp, method, path)
+            signatures[key] = signature
+
+        headers = self._base_headers.copy()
+        headers["KALSHI-ACCESS-SIGNATURE"] = signature
+        headers["KALSHI-ACCESS-TIMESTAMP"] = timestamp
+        return headers
 
     def _request(self, method: str, endpoint: str, params: dict = None, json: dict = None) -> dict:
         """Make authenticated request to Kalshi API"""
@@ -28,16 +75,17 @@ class KalshiClient:
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers(method, path)
 
-        response = requests.request(
+        response = self.session.request(
             method=method,
             url=url,
             headers=headers,
             params=params,
-            json=json
+            data=fastjson.dumps(json) if json is not None else None,
+            timeout=config.HTTP_TIMEOUT
         )
 
         response.raise_for_status()
-        return response.json()
+        return fastjson.loads(response.content)
 
     # Account endpoints
     def get_balance(self) -> dict:
@@ -66,16 +114,33 @@ class KalshiClient:
         return positions
 
     # Order endpoints
-    def get_orders(self, status: str = None) -> dict:
-        """Get orders. Status can be 'resting', 'canceled', 'executed'"""
+    def get_orders(self, status: str = None, ticker: str = None) -> dict:
+        """Get orders. Status can be 'resting', 'canceled', 'executed'; ticker limits to one market"""
         params = {}
         if status:
             params["status"] = status
+        if ticker:
+            params["ticker"] = ticker
         return self._request("GET", "/portfolio/orders", params=params)
 
-    def get_resting_orders(self) -> list:
-        """Get open/resting orders"""
-        return self.get_orders(status="resting").get('orders', [])
+    def get_resting_orders(self, ticker: str = None) -> list:
+        """Get open/resting orders, optionally for a single market"""
+        return self.get_orders(status="resting", ticker=ticker).get('orders', [])
+
+    @staticmethod
+    def _order_payload(ticker: str, side: str, action: str, price: int, count: int) -> dict:
+        """Build the request body for a limit order"""
+        payload = {
+            "ticker": ticker,
+            "side": side,
+            "action": action,
+            "type": "limit",
+            "count": count,
+        }
+        price_field = _PRICE_FIELDS.get(side)
+        if price_field:
+            payload[price_field] = price
+        return payload
 
     def place_order(
         self,
@@ -86,22 +151,38 @@ class KalshiClient:
         count: int      # Number of contracts
     ) -> dict:
         """Place a limit order"""
-        payload = {
-            "ticker": ticker,
-            "side": side,
-            "action": action,
-            "type": "limit",
-            "count": count,
-            "yes_price": price if side == "yes" else None,
-            "no_price": price if side == "no" else None,
-        }
-        payload = {k: v for k, v in payload.items() if v is not None}
+        payload = self._order_payload(ticker, side, action, price, count)
         return self._request("POST", "/portfolio/orders", json=payload)
 
+    def batch_create_orders(self, orders: list) -> list:
+        """
+        Place up to MAX_BATCH_ORDERS limit orders in a single request.
+
+        Each order is a dict of place_order's arguments. Returns one result
+        per order, in the same order: {'order': {...}} on success or
+        {'error': {...}} if that order was rejected.
+        """
+        if len(orders) > MAX_BATCH_ORDERS:
+            raise ValueError(f"Batch of {len(orders)} orders exceeds the {MAX_BATCH_ORDERS}-order limit")
+        payload = {"orders": [self._order_payload(**o) for o in orders]}
+        return self._request("POST", "/portfolio/orders/batched", json=payload).get('orders', [])
+
     def cancel_order(self, order_id: str) -> dict:
         """Cancel an existing order"""
         return self._request("DELETE", f"/portfolio/orders/{order_id}")
 
+    def batch_cancel_orders(self, order_ids: list) -> list:
+        """
+        Cancel up to MAX_BATCH_ORDERS orders in a single request.
+
+        Returns one result per order id, in the same order; a result with
+        an 'error' key was not canceled.
+        """
+        if len(order_ids) > MAX_BATCH_ORDERS:
+            raise ValueError(f"Batch of {len(order_ids)} cancels exceeds the {MAX_BATCH_ORDERS}-order limit")
+        payload = {"ids": list(order_ids)}
+        return self._request("DELETE", "/portfolio/orders/batched", json=payload).get('orders', [])
+
     # Trade history
     def get_fills(self, limit: int = 100, cursor: str = None) -> dict:
         """Get trade fills (executed trades)"""
@@ -118,18 +199,21 @@ class KalshiClient:
             params["cursor"] = cursor
         return self._request("GET", "/markets", params=params)
 
-    def fetch_all_markets(self, status: str = "open", max_pages: int = 10) -> list:
-        """Fetch all markets with pagination"""
+    def fetch_all_markets(self, status: str = "open", max_markets: int = 2000) -> list:
+        """Fetch all markets with pagination, in the largest pages the API allows"""
         all_markets = []
         cursor = None
+        max_pages = (max_markets + MARKETS_PAGE_SIZE - 1) // MARKETS_PAGE_SIZE
 
         for _ in range(max_pages):
-            params = {'limit': 200, 'status': status}
+            params = {'limit': MARKETS_PAGE_SIZE, 'status': status}
             if cursor:
                 params['cursor'] = cursor
 
-            response = requests.get(f"{self.base_url}/markets", params=params)
-            data = response.json()
+            response = self.session.get(f"{self.base_url}/markets", params=params,
+                                        timeout=config.HTTP_TIMEOUT)
+            response.raise_for_status()
+            data = fastjson.loads(response.content)
             markets = data.get('markets', [])
             cursor = data.get('cursor')
             all_markets.extend(markets)
@@ -157,15 +241,15 @@ class KalshiClient:
             spread = ask - bid if (bid > 0 and ask < 100) else 0
             return (spread, m.get('volume', 0))
 
-        active.sort(key=sort_key, reverse=True)
-        return active[:limit]
+        # Only the top few are returned; skip sorting the rest
+        return heapq.nlargest(limit, active, key=sort_key)
 
     # Exchange status (public endpoint)
     def get_exchange_status(self) -> dict:
         """Get exchange status (public endpoint)"""
-        response = requests.get(f"{self.base_url}/exchange/status")
+        response = self.session.get(f"{self.base_url}/exchange/status", timeout=config.HTTP_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        return fastjson.loads(response.content)
 
 
 def main():
@@ -29,6 +29,25 @@ WS_PATH = "/trade-api/ws/v2"
 # REST_URL = "https://api.elections.kalshi.com/trade-api/v2"
 # WS_URL = "wss://api.elections.kalshi.com/trade-api/ws/v2"
 
+# WebSocket connection options (passed to websockets.connect)
+# Orderbook frames are small JSON, so permessage-deflate costs more CPU
+# to inflate than it saves in bandwidth.
+WS_CONNECT_OPTIONS = {
+    'compression': None,       # Disable permessage-deflate
+    'max_size': 2 ** 20,       # Max incoming frame size (bytes)
+    'ping_interval': 20,       # Seconds between keepalive pings
+    'ping_timeout': 10,        # Seconds to wait for a pong
+}
+
+# Keep-alive connections held by each KalshiClient session. Orders and
+# cancels are sent from worker threads, and requests discards (and later
+# re-handshakes) any connection beyond this many in use at once.
+HTTP_POOL_SIZE = 16
+
+# Seconds to wait for a REST connection or response before giving up, so a
+# stalled request can't hang a worker thread (or shutdown) indefinitely
+HTTP_TIMEOUT = 10
+
 # Trading Configuration
 DEFAULT_CONFIG = {
     'min_spread': 3,           # Minimum spread to trade (cents)
@@ -38,5 +57,5 @@ DEFAULT_CONFIG = {
     'order_timeout': 10,       # Cancel orders after N seconds
     'aggressive_spread': 10,   # Spread threshold for aggressive entry
     'refresh_interval': 3,     # Seconds between order management cycles
-    'max_threads': 20,         # Max concurrent market threads
+    'max_threads': 20,         # Max concurrent market traders
 }
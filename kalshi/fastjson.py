@@ -0,0 +1,36 @@
+"""
+Kalshi JSON Helpers
+-------------------
+JSON encoding/decoding for API and WebSocket payloads.
+Uses orjson when installed, falling back to the standard library.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import json
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data):
+        """Decode JSON from str or bytes"""
+        return orjson.loads(data)
+
+    def dumps(obj) -> str:
+        """Encode obj as a compact JSON string"""
+        return orjson.dumps(obj).decode('utf-8')
+
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        """Decode JSON from str or bytes"""
+        return json.loads(data)
+
+    def dumps(obj) -> str:
+        """Encode obj as a compact JSON string"""
+        return json.dumps(obj, separators=(',', ':'))
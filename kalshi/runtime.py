@@ -0,0 +1,69 @@
+"""
+Kalshi Runtime Helpers
+----------------------
+Logging and event loop setup shared by the bots and strategies.
+"""
+
+import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+try:
+    import uvloop  # Faster event loop (not available on Windows)
+except ImportError:
+    uvloop = None
+
+_log_listeners = {}  # Logger name -> running QueueListener
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime at most once per second of log time"""
+
+    def __init__(self, fmt: str, datefmt: str = None):
+        super().__init__(fmt, datefmt)
+        self._cached_sec = None
+        self._cached_str = ""
+
+    def formatTime(self, record, datefmt=None):
+        # Only the listener thread formats records, so no locking needed
+        sec = int(record.created)
+        if sec != self._cached_sec:
+            self._cached_sec = sec
+            self._cached_str = super().formatTime(record, datefmt)
+        return self._cached_str
+
+
+def start_log_listener(logger: logging.Logger, fmt: str = "[%(asctime)s] %(message)s",
+                       datefmt: str = "%H:%M:%S"):
+    """
+    Route logger's records through a queue.
+
+    The caller only enqueues records; a background thread formats the
+    timestamp and writes to stdout, so a slow terminal or pipe never
+    stalls the event loop. Safe to call more than once per logger.
+    """
+    if logger.name in _log_listeners:
+        return
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_CachedTimeFormatter(fmt, datefmt))
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued lines on exit
+    _log_listeners[logger.name] = listener
+
+
+def run_event_loop(coro):
+    """Run coro to completion, on uvloop when it is installed"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
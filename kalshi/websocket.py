@@ -5,7 +5,6 @@ WebSocket client for real-time Kalshi market data.
 """
 
 import asyncio
-import json
 import requests
 
 try:
@@ -16,6 +15,7 @@ except ImportError:
 
 from . import config
 from . import auth
+from . import fastjson
 
 
 def fetch_active_markets(base_url: str = None, limit: int = 100) -> list:
@@ -26,7 +26,7 @@ def fetch_active_markets(base_url: str = None, limit: int = 100) -> list:
         params={"limit": limit, "status": "open"}
     )
     response.raise_for_status()
-    markets = response.json().get("markets", [])
+    markets = fastjson.loads(response.content).get("markets", [])
 
     # Filter for markets with activity
     active = [
@@ -52,6 +52,13 @@ class KalshiWebSocket:
         self.ws_path = config.WS_PATH
         self.orderbooks = {}  # Store orderbook state per market
 
+        # Market data handlers keyed by message type
+        self.handlers = {
+            "orderbook_snapshot": self._handle_snapshot,
+            "orderbook_delta": self._apply_delta,
+            "ticker": self.process_ticker,
+        }
+
     def _get_auth_headers(self) -> dict:
         """Generate authentication headers for websocket connection"""
         return auth.get_ws_auth_headers(self.api_key, self.private_key, self.ws_path)
@@ -59,7 +66,11 @@ class KalshiWebSocket:
     async def connect(self):
         """Establish websocket connection"""
         headers = self._get_auth_headers()
-        return await websockets.connect(self.ws_url, additional_headers=headers)
+        return await websockets.connect(
+            self.ws_url,
+            additional_headers=headers,
+            **config.WS_CONNECT_OPTIONS
+        )
 
     async def subscribe_orderbook(self, ws, market_tickers: list):
         """Subscribe to orderbook updates for specified markets"""
@@ -71,7 +82,7 @@ class KalshiWebSocket:
                 "market_tickers": market_tickers
             }
         }
-        await ws.send(json.dumps(subscription))
+        await ws.send(fastjson.dumps(subscription))
         print(f"Subscribed to orderbook for: {market_tickers}")
 
     async def subscribe_ticker(self, ws, market_tickers: list):
@@ -84,26 +95,43 @@ class KalshiWebSocket:
                 "market_tickers": market_tickers
             }
         }
-        await ws.send(json.dumps(subscription))
+        await ws.send(fastjson.dumps(subscription))
         print(f"Subscribed to ticker for: {market_tickers}")
 
     def process_orderbook_snapshot(self, data: dict):
         """Process initial orderbook snapshot"""
+        ticker = self._apply_snapshot(data)
+        if ticker:
+            self._display_orderbook(ticker)
+
+    def _apply_snapshot(self, data: dict):
+        """Store an orderbook snapshot; returns the ticker it updated"""
         ticker = data.get("market_ticker")
         if not ticker:
-            return
+            return None
 
         self.orderbooks[ticker] = {
             "yes": data.get("yes", []),
             "no": data.get("no", [])
         }
-        self._display_orderbook(ticker)
+        return ticker
+
+    def _handle_snapshot(self, data: dict):
+        """Announce and store an orderbook snapshot message"""
+        print("\n[SNAPSHOT] Received orderbook snapshot")
+        return self._apply_snapshot(data)
 
     def process_orderbook_delta(self, data: dict):
         """Process orderbook delta (incremental update)"""
+        ticker = self._apply_delta(data)
+        if ticker:
+            self._display_orderbook(ticker)
+
+    def _apply_delta(self, data: dict):
+        """Apply an orderbook delta; returns the ticker it updated"""
         ticker = data.get("market_ticker")
         if not ticker or ticker not in self.orderbooks:
-            return
+            return None
 
         price = data.get("price")
         delta = data.get("delta")
@@ -123,7 +151,7 @@ class KalshiWebSocket:
                 book.append([price, delta])
                 book.sort(key=lambda x: x[0], reverse=(side == "yes"))
 
-        self._display_orderbook(ticker)
+        return ticker
 
     def _display_orderbook(self, ticker: str):
         """Display current orderbook state with bid/ask spread"""
@@ -171,33 +199,72 @@ class KalshiWebSocket:
         print(f" | Last: {last_price}c | Vol: {volume}")
 
     async def listen(self, ws):
-        """Listen for and process incoming messages"""
-        async for message in ws:
+        """
+        Listen for and process incoming messages.
+
+        A reader task queues frames as they arrive. Each pass drains
+        everything already queued, applies all of it, then redraws each
+        updated orderbook once, so bursts don't print a book per delta.
+        """
+        queue = asyncio.Queue()
+
+        async def read_frames():
             try:
-                data = json.loads(message)
-                msg_type = data.get("type")
+                async for message in ws:
+                    queue.put_nowait(message)
+            finally:
+                queue.put_nowait(None)  # Connection closed
 
-                if msg_type == "orderbook_snapshot":
-                    print("\n[SNAPSHOT] Received orderbook snapshot")
-                    self.process_orderbook_snapshot(data.get("msg", {}))
+        reader = asyncio.create_task(read_frames())
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                updated = {}  # Tickers to redraw, in arrival order
+                closed = False
+                for message in batch:
+                    if message is None:
+                        closed = True
+                        break
+                    ticker = self._handle_message(message)
+                    if ticker:
+                        updated[ticker] = None
+
+                for ticker in updated:
+                    self._display_orderbook(ticker)
+
+                if closed:
+                    await reader  # Re-raise any connection error
+                    return
+        finally:
+            reader.cancel()
+
+    def _handle_message(self, message):
+        """Process one raw frame; returns the ticker whose orderbook changed"""
+        try:
+            data = fastjson.loads(message)
+        except fastjson.JSONDecodeError:
+            print(f"[RAW] {message}")
+            return None
 
-                elif msg_type == "orderbook_delta":
-                    self.process_orderbook_delta(data.get("msg", {}))
+        msg_type = data.get("type")
+        handler = self.handlers.get(msg_type)
 
-                elif msg_type == "ticker":
-                    self.process_ticker(data.get("msg", {}))
+        if handler is not None:
+            return handler(data.get("msg", {}))
 
-                elif msg_type == "subscribed":
-                    print(f"[OK] Subscription confirmed: {data}")
+        elif msg_type == "subscribed":
+            print(f"[OK] Subscription confirmed: {data}")
 
-                elif msg_type == "error":
-                    print(f"[ERROR] {data}")
+        elif msg_type == "error":
+            print(f"[ERROR] {data}")
 
-                else:
-                    print(f"[MSG] {data}")
+        else:
+            print(f"[MSG] {data}")
 
-            except json.JSONDecodeError:
-                print(f"[RAW] {message}")
+        return None
 
     async def run(self, market_tickers: list):
         """Main run loop - connect and subscribe to markets"""
@@ -206,7 +273,8 @@ class KalshiWebSocket:
         try:
             async with websockets.connect(
                 self.ws_url,
-                additional_headers=self._get_auth_headers()
+                additional_headers=self._get_auth_headers(),
+                **config.WS_CONNECT_OPTIONS
             ) as ws:
                 print("Connected!")
 
@@ -232,7 +300,7 @@ async def main():
     if not active_markets:
         print("No active markets found. Using all open markets instead.")
         response = requests.get(f"{config.REST_URL}/markets", params={"limit": 20, "status": "open"})
-        all_markets = response.json().get("markets", [])
+        all_markets = fastjson.loads(response.content).get("markets", [])
         tickers = [m["ticker"] for m in all_markets[:10]]
     else:
         print(f"\nFound {len(active_markets)} active markets:")
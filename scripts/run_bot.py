@@ -13,6 +13,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from bots.trading_bot_mt import TradingBotMT
+from kalshi.runtime import run_event_loop
 
 
 async def main():
@@ -26,11 +27,12 @@ async def main():
 
     try:
         await bot.run()
-    except KeyboardInterrupt:
+    except asyncio.CancelledError:
         print("\nShutting down...")
-        bot.stop()
+    finally:
+        await bot.stop()
 
 
 if __name__ == "__main__":
     sys.stdout.reconfigure(line_buffering=True)
-    asyncio.run(main())
+    run_event_loop(main())
@@ -13,10 +13,11 @@ Example:
 """
 
 import asyncio
-import json
-from dataclasses import dataclass
+import logging
 from typing import Optional
 
+from sortedcontainers import SortedDict
+
 try:
     import websockets
 except ImportError:
@@ -25,34 +26,84 @@ except ImportError:
 
 import sys
 import os
+import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from kalshi import config
+from kalshi import fastjson
 from kalshi.client import KalshiClient
+from kalshi.batcher import OrderBatcher
 from kalshi.websocket import KalshiWebSocket, fetch_active_markets
 from kalshi import auth
+from kalshi.runtime import start_log_listener, run_event_loop
+
+logger = logging.getLogger(__name__)
+
+# Raw WebSocket frames buffered between the socket reader and the consumer
+FRAME_QUEUE_SIZE = 1024
+
+# Seconds a frame may wait in the queue before quotes are pulled as stale
+MAX_FRAME_LAG = 1.0
+
+# Minimum seconds between trade evaluation passes over updated tickers
+EVAL_INTERVAL = 0.02
+
+# Minimum seconds between Bid/Ask/Spread lines for one ticker (unless verbose)
+BOOK_LOG_INTERVAL = 1.0
+
+# Longest wait (seconds) between WebSocket reconnect attempts
+RECONNECT_MAX_DELAY = 30
 
 
-@dataclass
 class OrderbookState:
-    """Current state of a market's orderbook"""
-    ticker: str
-    best_bid: Optional[int] = None  # Highest YES bid (cents)
-    best_ask: Optional[int] = None  # Lowest YES ask (cents)
-    bid_qty: int = 0                # Quantity at best bid
-    ask_qty: int = 0                # Quantity at best ask
-
-    @property
-    def spread(self) -> Optional[int]:
+    """
+    Current state of a market's orderbook
+
+    Top of book and spread are plain attributes, recomputed by refresh()
+    after each update rather than on every read.
+    """
+
+    __slots__ = ("ticker", "bids", "asks", "best_bid", "best_ask",
+                 "bid_qty", "ask_qty", "spread", "is_tradeable")
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.bids = SortedDict()  # YES bid price -> qty
+        self.asks = SortedDict()  # Implied YES ask (100 - NO bid) -> qty
+        self.best_bid: Optional[int] = None  # Highest YES bid (cents)
+        self.best_ask: Optional[int] = None  # Lowest YES ask (cents)
+        self.bid_qty = 0  # Quantity at best bid
+        self.ask_qty = 0  # Quantity at best ask
+        self.spread: Optional[int] = None
+        self.is_tradeable = False
+
+    def refresh(self, min_spread: int) -> bool:
+        """
+        Recompute top of book and whether the spread is wide enough to trade.
+
+        Returns True if the best bid or best ask price moved.
+        """
+        prev_bid, prev_ask = self.best_bid, self.best_ask
+
+        if self.bids:
+            self.best_bid, self.bid_qty = self.bids.peekitem(-1)
+        else:
+            self.best_bid, self.bid_qty = None, 0
+
+        if self.asks:
+            self.best_ask, self.ask_qty = self.asks.peekitem(0)
+        else:
+            self.best_ask, self.ask_qty = None, 0
+
         if self.best_bid and self.best_ask:
-            return self.best_ask - self.best_bid
-        return None
+            self.spread = self.best_ask - self.best_bid
+        else:
+            self.spread = None
 
-    @property
-    def is_tradeable(self) -> bool:
-        """Check if spread is wide enough to profit (after fees)"""
         # Kalshi fee is ~1c per contract, so need 3c+ spread to profit
-        return self.spread is not None and self.spread >= 3
+        self.is_tradeable = self.spread is not None and self.spread >= min_spread
+
+        return self.best_bid != prev_bid or self.best_ask != prev_ask
 
 
 class MarketMaker:
@@ -71,6 +122,7 @@ class MarketMaker:
         self.private_key_path = private_key_path or config.PRIVATE_KEY_PATH
         self.private_key = auth.load_private_key(self.private_key_path)
         self.client = KalshiClient(self.api_key, self.private_key_path)
+        start_log_listener(logger, fmt="%(message)s")
 
         self.orderbooks: dict[str, OrderbookState] = {}
         self.active_orders: dict[str, dict] = {}
@@ -82,81 +134,126 @@ class MarketMaker:
         self.order_size = config.DEFAULT_CONFIG['order_size']
         self.edge = config.DEFAULT_CONFIG['edge']
         self.live_trading = True
+        self.verbose = False  # Print every orderbook update, not one per BOOK_LOG_INTERVAL
+        self._book_logged: dict[str, float] = {}  # Ticker -> when its book line last printed
         self.pending_orders: dict[str, list] = {}
+        self._lagging = False  # Consumer is behind the feed; don't quote
+
+        # Tickers updated since the last evaluation pass
+        self._dirty: set[str] = set()
+        self._eval_event: Optional[asyncio.Event] = None  # Created per connection
+
+        # Quotes from one evaluation pass share a batched order request
+        self.batcher = OrderBatcher(self.client)
+        self._quoting: set[str] = set()  # Tickers with a quote queued or in flight
+        self._quote_tasks: set[asyncio.Task] = set()
+        self._cancel_task: Optional[asyncio.Task] = None  # Pulls quotes when the feed lags
+        self._sub_payload: Optional[tuple[tuple, str]] = None  # (tickers, encoded subscribe)
 
     # ==================== Orderbook Processing ====================
 
-    def process_orderbook_snapshot(self, data: dict):
-        """Process initial orderbook state"""
+    def process_orderbook_snapshot(self, data: dict) -> Optional[str]:
+        """Process initial orderbook state; returns the updated ticker"""
         ticker = data.get("market_ticker")
         if not ticker:
-            return
-
-        yes_orders = sorted(data.get("yes", []), key=lambda x: x[0], reverse=True)
-        no_orders = sorted(data.get("no", []), key=lambda x: x[0], reverse=True)
+            return None
 
         state = OrderbookState(ticker=ticker)
 
-        if yes_orders:
-            state.best_bid = yes_orders[0][0]
-            state.bid_qty = yes_orders[0][1]
+        for price, qty in data.get("yes") or ():
+            state.bids[price] = qty
 
-        if no_orders:
-            state.best_ask = 100 - no_orders[0][0]
-            state.ask_qty = no_orders[0][1]
+        # A NO bid at p is an offer to sell YES at 100 - p
+        for price, qty in data.get("no") or ():
+            state.asks[100 - price] = qty
 
+        state.refresh(self.min_spread)
         self.orderbooks[ticker] = state
-        self._on_orderbook_update(ticker)
+        return ticker
 
-    def process_orderbook_delta(self, data: dict):
-        """Process orderbook update"""
-        ticker = data.get("market_ticker")
-        if not ticker or ticker not in self.orderbooks:
-            return
+    def process_orderbook_delta(self, data: dict) -> Optional[str]:
+        """
+        Process orderbook update; returns the ticker if its top of book moved.
+
+        Deltas at deeper levels, or that only change size at the best
+        prices, don't change our quotes, so they don't trigger evaluation.
+        """
+        state = self.orderbooks.get(data.get("market_ticker"))
+        if state is None:
+            return None
 
         price = data.get("price")
         delta = data.get("delta")
         side = data.get("side")
 
-        state = self.orderbooks[ticker]
+        if price is None or delta is None:
+            return None
 
         if side == "yes":
-            if delta > 0 and (state.best_bid is None or price > state.best_bid):
-                state.best_bid = price
-                state.bid_qty = delta
-            elif delta < 0 and price == state.best_bid:
-                pass
-
+            book = state.bids
         elif side == "no":
-            implied_ask = 100 - price
-            if delta > 0 and (state.best_ask is None or implied_ask < state.best_ask):
-                state.best_ask = implied_ask
-                state.ask_qty = delta
+            book = state.asks
+            price = 100 - price
+        else:
+            return None
+
+        qty = book.get(price, 0) + delta
+        if qty > 0:
+            book[price] = qty
+        else:
+            book.pop(price, None)
 
-        self._on_orderbook_update(ticker)
+        if not state.refresh(self.min_spread):
+            return None
+        return state.ticker
 
     def _on_orderbook_update(self, ticker: str):
-        """Called whenever orderbook updates - check for trading opportunity"""
+        """Called whenever orderbook updates - queue ticker for evaluation"""
+        self._dirty.add(ticker)
+        self._eval_event.set()
+
+    async def _eval_loop(self):
+        """
+        Evaluate updated tickers in batches.
+
+        A burst of deltas on one ticker marks it dirty once, so it is
+        evaluated once per pass against its latest book.
+        """
+        while True:
+            await self._eval_event.wait()
+            self._eval_event.clear()
+
+            tickers, self._dirty = self._dirty, set()
+            for ticker in tickers:
+                await self._check_opportunity(ticker)
+
+            await asyncio.sleep(EVAL_INTERVAL)
+
+    async def _check_opportunity(self, ticker: str):
+        """Check an updated orderbook for a trading opportunity"""
         state = self.orderbooks.get(ticker)
-        if not state:
+        if not state or self._lagging:
             return
 
         spread = state.spread
 
-        print(f"[{ticker}] Bid: {state.best_bid}c | Ask: {state.best_ask}c | Spread: {spread}c")
+        now = time.monotonic()
+        if self.verbose or now - self._book_logged.get(ticker, 0.0) >= BOOK_LOG_INTERVAL:
+            self._book_logged[ticker] = now
+            logger.info("[%s] Bid: %sc | Ask: %sc | Spread: %sc", ticker, state.best_bid, state.best_ask, spread)
 
         if state.is_tradeable:
-            print(f"  -> OPPORTUNITY: {spread}c spread - profitable to market make!")
-            self._evaluate_trade(ticker, state)
+            logger.info("  -> OPPORTUNITY: %sc spread - profitable to market make!", spread)
+            await self._evaluate_trade(ticker, state)
 
     # ==================== Trading Logic ====================
 
-    def _evaluate_trade(self, ticker: str, state: OrderbookState):
+    async def _evaluate_trade(self, ticker: str, state: OrderbookState):
         """Evaluate and potentially execute a market making trade"""
         current_position = self.positions.get(ticker, 0)
 
         if abs(current_position) >= self.max_position:
-            print(f"  x Position limit reached ({current_position})")
+            logger.info("  x Position limit reached (%s)", current_position)
             return
 
         our_bid = state.best_bid + self.edge
@@ -164,98 +261,220 @@ class MarketMaker:
 
         our_spread = our_ask - our_bid
         if our_spread < 1:
-            print(f"  x Spread too tight after edge ({our_spread}c)")
+            logger.info("  x Spread too tight after edge (%sc)", our_spread)
             return
 
-        print(f"  -> Strategy: Buy at {our_bid}c, Sell at {our_ask}c")
-        print(f"  -> Expected profit: {our_spread}c per contract")
-        print(f"  -> Order size: {self.order_size} contracts")
-
-        self._place_market_making_orders(ticker, our_bid, our_ask)
-
-    def _place_market_making_orders(self, ticker: str, bid_price: int, ask_price: int):
-        """Place both sides of market making trade"""
-        if ticker in self.pending_orders and len(self.pending_orders[ticker]) > 0:
-            print(f"  - Already have pending orders for {ticker}, skipping")
+        logger.info("  -> Strategy: Buy at %sc, Sell at %sc", our_bid, our_ask)
+        logger.info("  -> Expected profit: %sc per contract", our_spread)
+        logger.info("  -> Order size: %s contracts", self.order_size)
+
+        await self._place_market_making_orders(ticker, our_bid, our_ask)
+
+    async def _place_market_making_orders(self, ticker: str, bid_price: int, ask_price: int):
+        """
+        Queue both sides of market making trade.
+
+        Quotes from all tickers are collected and sent together by the
+        order batcher, so a burst of opportunities costs one HTTP request
+        instead of two per ticker.
+        """
+        # A ticker is idle, quoting (in _quoting) or open (in pending_orders).
+        # There is no await between this check and marking it quoting, so
+        # two evaluations on the event loop can't both place quotes.
+        if self.pending_orders.get(ticker) or ticker in self._quoting:
+            logger.info("  - Already have pending orders for %s, skipping", ticker)
             return
 
         if not self.live_trading:
-            print(f"  [DRY RUN] Would place BUY {self.order_size} @ {bid_price}c, SELL @ {ask_price}c")
+            logger.info("  [DRY RUN] Would place BUY %s @ %sc, SELL @ %sc", self.order_size, bid_price, ask_price)
             return
 
+        logger.info("  >> Queueing BUY %s @ %sc, SELL %s @ %sc", self.order_size, bid_price, self.order_size, ask_price)
+        self._quoting.add(ticker)
+        task = asyncio.create_task(self._send_quote(ticker, bid_price, ask_price))
+        self._quote_tasks.add(task)
+        task.add_done_callback(self._quote_tasks.discard)
+
+    async def _send_quote(self, ticker: str, bid_price: int, ask_price: int):
+        """
+        Place one quote through the order batcher and record the result.
+
+        Both legs always go in the same batch, so a ticker is either fully
+        quoted or its placed leg is canceled.
+        """
+        orders = [
+            dict(ticker=ticker, side="yes", action="buy", price=bid_price, count=self.order_size),
+            dict(ticker=ticker, side="yes", action="sell", price=ask_price, count=self.order_size),
+        ]
+        send = asyncio.ensure_future(self.batcher.submit(orders))
+        closing = False
         try:
-            order_ids = []
-
-            print(f"  >> Placing BUY order: {self.order_size} @ {bid_price}c")
-            buy_order = self.client.place_order(
-                ticker=ticker,
-                side="yes",
-                action="buy",
-                price=bid_price,
-                count=self.order_size
-            )
-            buy_id = buy_order.get('order', {}).get('order_id')
-            order_ids.append(buy_id)
-            print(f"  OK BUY order placed: {buy_id}")
-
-            print(f"  >> Placing SELL order: {self.order_size} @ {ask_price}c")
-            sell_order = self.client.place_order(
-                ticker=ticker,
-                side="yes",
-                action="sell",
-                price=ask_price,
-                count=self.order_size
-            )
-            sell_id = sell_order.get('order', {}).get('order_id')
-            order_ids.append(sell_id)
-            print(f"  OK SELL order placed: {sell_id}")
+            await asyncio.shield(send)
+        except asyncio.CancelledError:
+            # Connection is closing: wait for the request already queued so
+            # its orders are tracked and canceled with the rest
+            closing = True
+            await asyncio.wait([send])
 
+        try:
+            legs = send.result()
+        except Exception as e:
+            logger.error("  x [%s] Quote failed: %s", ticker, e)
+            legs = []
+
+        await self._record_quote(ticker, legs)
+
+        if closing:
+            raise asyncio.CancelledError
+
+    async def _record_quote(self, ticker: str, legs: list):
+        """Track a placed quote, or cancel its placed leg if the other failed"""
+        self._quoting.discard(ticker)
+
+        order_ids = []
+        failed = len(legs) < 2
+        for label, result in zip(("BUY", "SELL"), legs):
+            order_id = (result.get('order') or {}).get('order_id')
+            if not order_id:
+                logger.error("  x [%s] %s order failed: %s", ticker, label, result.get('error'))
+                failed = True
+                continue
+            order_ids.append(order_id)
+            logger.info("  OK [%s] %s order placed: %s", ticker, label, order_id)
+
+        # Quotes priced while the feed lagged are stale; the lag handler
+        # has already pulled pending_orders, so cancel these here too
+        if not failed and not self._lagging:
             self.pending_orders[ticker] = order_ids
+            return
 
-        except Exception as e:
-            print(f"  x Order failed: {e}")
-            if order_ids:
-                print(f"  ~ Canceling partial orders...")
-                for oid in order_ids:
-                    try:
-                        self.client.cancel_order(oid)
-                        print(f"  Canceled: {oid}")
-                    except:
-                        pass
+        if order_ids:
+            if failed:
+                logger.info("  ~ Canceling partial orders...")
+            else:
+                logger.info("  ~ Feed lagging - canceling new quote...")
+            for oid in order_ids:
+                try:
+                    await asyncio.to_thread(self.client.cancel_order, oid)
+                    logger.info("  Canceled: %s", oid)
+                except Exception:
+                    pass
 
     # ==================== WebSocket Connection ====================
 
     async def subscribe(self, ws, tickers: list):
         """Subscribe to orderbook updates"""
-        subscription = {
-            "id": 1,
-            "cmd": "subscribe",
-            "params": {
-                "channels": ["orderbook_delta"],
-                "market_tickers": tickers
+        # Encoded once and reused on every (re)connect to the same markets
+        key = tuple(tickers)
+        if self._sub_payload is None or self._sub_payload[0] != key:
+            subscription = {
+                "id": 1,
+                "cmd": "subscribe",
+                "params": {
+                    "channels": ["orderbook_delta"],
+                    "market_tickers": tickers
+                }
             }
-        }
-        await ws.send(json.dumps(subscription))
-        print(f"Subscribed to: {tickers}")
+            self._sub_payload = (key, fastjson.dumps(subscription))
+
+        await ws.send(self._sub_payload[1])
+        logger.info("Subscribed to: %s", tickers)
 
     async def listen(self, ws):
-        """Listen for orderbook updates"""
-        async for message in ws:
-            try:
-                data = json.loads(message)
+        """
+        Listen for orderbook updates.
+
+        This coroutine only reads frames off the socket into a bounded
+        queue, so the connection keeps draining while a consumer task
+        decodes frames and applies them to the books. If the consumer
+        falls far enough behind to fill the queue, books would miss
+        deltas, so listen returns instead and run() reconnects to resync
+        from fresh snapshots. Trade evaluation and order placement run in
+        separate tasks, so neither holds up book updates.
+        """
+        queue = asyncio.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self._eval_event = asyncio.Event()
+        consumer = asyncio.create_task(self._consume(queue))
+        evaluator = asyncio.create_task(self._eval_loop())
+
+        try:
+            async for message in ws:
+                for task in (consumer, evaluator):
+                    if task.done():
+                        task.result()  # Surface task errors
+
+                try:
+                    queue.put_nowait((time.monotonic(), message))
+                except asyncio.QueueFull:
+                    logger.warning("[WARN] Frame queue overflowed - reconnecting to resync orderbooks")
+                    return
+        finally:
+            tasks = (consumer, evaluator, *self._quote_tasks)
+            for task in tasks:
+                task.cancel()
+            # Let in-flight quotes finish recording their results
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _consume(self, queue: asyncio.Queue):
+        """
+        Decode queued frames and apply them in arrival order.
+
+        Each wakeup drains everything already queued and applies it without
+        yielding, so a burst costs one pass through the event loop.
+
+        Books stay correct while the consumer is behind, but they lag the
+        market: once a frame has waited longer than MAX_FRAME_LAG, resting
+        quotes are pulled and no new ones are placed until the queue drains.
+        """
+        # Bound once: this loop runs for every frame on the feed
+        loads = fastjson.loads
+        apply_delta = self.process_orderbook_delta
+        apply_snapshot = self.process_orderbook_snapshot
+        on_update = self._on_orderbook_update
+
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Oldest frame first, so its wait is the lag of the whole batch
+            lag = time.monotonic() - batch[0][0]
+            if lag > MAX_FRAME_LAG:
+                if not self._lagging:
+                    self._lagging = True
+                    logger.warning("[WARN] Feed %.1fs behind - pulling quotes until caught up", lag)
+                    self._cancel_task = asyncio.create_task(self._cancel_pending_orders())
+            elif self._lagging:
+                self._lagging = False
+                logger.info("[OK] Feed caught up - quoting resumed")
+                # Evaluations skipped while lagging won't rerun until the
+                # top of book moves, so requeue every quotable book now
+                self._dirty.update(t for t, state in self.orderbooks.items() if state.is_tradeable)
+                if self._dirty:
+                    self._eval_event.set()
+
+            for _, message in batch:
+                try:
+                    data = loads(message)
+                except fastjson.JSONDecodeError:
+                    logger.info("[RAW] %s", message)
+                    continue
+
                 msg_type = data.get("type")
 
-                if msg_type == "orderbook_snapshot":
-                    self.process_orderbook_snapshot(data.get("msg", {}))
-                elif msg_type == "orderbook_delta":
-                    self.process_orderbook_delta(data.get("msg", {}))
+                # Deltas first: they are almost all of the traffic
+                if msg_type == "orderbook_delta":
+                    ticker = apply_delta(data.get("msg", {}))
+                    if ticker:
+                        on_update(ticker)
+                elif msg_type == "orderbook_snapshot":
+                    ticker = apply_snapshot(data.get("msg", {}))
+                    if ticker:
+                        on_update(ticker)
                 elif msg_type == "subscribed":
-                    print(f"[OK] Subscription confirmed")
+                    logger.info("[OK] Subscription confirmed")
                 elif msg_type == "error":
-                    print(f"[ERROR] {data}")
-
-            except json.JSONDecodeError:
-                print(f"[RAW] {message}")
+                    logger.error("[ERROR] %s", data)
 
     async def run(self, tickers: list):
         """Main run loop"""
@@ -274,17 +493,53 @@ class MarketMaker:
         except Exception as e:
             print(f"Could not fetch balance: {e}")
 
-        print("\nConnecting to WebSocket...")
+        attempt = 0
+        while True:
+            # Books from a dropped connection are stale: start from the
+            # snapshots sent after resubscribing
+            self.orderbooks.clear()
+            self._dirty.clear()
+            self._quoting.clear()
+            self._lagging = False
 
-        ws_headers = auth.get_ws_auth_headers(self.api_key, self.private_key, config.WS_PATH)
+            print("\nConnecting to WebSocket...")
+            ws_headers = auth.get_ws_auth_headers(self.api_key, self.private_key, config.WS_PATH)
 
-        async with websockets.connect(
-            config.WS_URL,
-            additional_headers=ws_headers
-        ) as ws:
-            print("Connected!")
-            await self.subscribe(ws, tickers)
-            await self.listen(ws)
+            try:
+                async with websockets.connect(
+                    config.WS_URL,
+                    additional_headers=ws_headers,
+                    **config.WS_CONNECT_OPTIONS
+                ) as ws:
+                    print("Connected!")
+                    attempt = 0
+                    await self.subscribe(ws, tickers)
+                    await self.listen(ws)
+                print("WebSocket closed")
+            except (websockets.WebSocketException, OSError) as e:
+                # Includes rejected handshakes (e.g. 429/503) on reconnect
+                print(f"WebSocket error: {e}")
+            except Exception as e:
+                # A consumer or evaluator task failed; resync from fresh snapshots
+                print(f"Unexpected error: {e!r}")
+
+            await self._cancel_pending_orders()
+
+            delay = min(RECONNECT_MAX_DELAY, 2 ** attempt)
+            attempt += 1
+            print(f"Reconnecting in {delay} seconds...")
+            await asyncio.sleep(delay)
+
+    async def _cancel_pending_orders(self):
+        """Cancel our resting quotes so none are left unmanaged while disconnected"""
+        pending, self.pending_orders = self.pending_orders, {}
+        for ticker, order_ids in pending.items():
+            for oid in order_ids:
+                try:
+                    await asyncio.to_thread(self.client.cancel_order, oid)
+                    logger.info("  Canceled: %s", oid)
+                except Exception as e:
+                    logger.error("  x [%s] Could not cancel %s: %s", ticker, oid, e)
 
 
 async def main():
@@ -318,4 +573,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())